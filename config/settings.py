@@ -88,6 +88,12 @@ DATABASES = {
         'PORT': 5432
     }
 }
+# model-generated text2sql queries run on their own connection, capped at 5s per statement
+DATABASES['text2sql'] = {
+    **DATABASES['default'],
+    'OPTIONS': {'options': '-c statement_timeout=5000'},
+    'TEST': {'MIRROR': 'default'},
+}
 
 CSV_ROOT = BASE_DIR / "data/raw"
 
@@ -1,18 +1,66 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import connection, transaction
+import numpy as np
 import pandas as pd
+import io
+import json
 import os
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from data_loader import models
 
-def parse_date_safe(val):
-    if pd.isna(val):
-        return None
-    try:
-        return pd.to_datetime(val, errors='coerce')
-    except Exception:
-        return None
+try:
+    import pyarrow as pa
+except ImportError:  # typed reads need pyarrow; fall back to the C parser with str columns
+    pa = None
+try:
+    import orjson
+except ImportError:  # report is dumped with stdlib json instead
+    orjson = None
+
+NA_VALUES = ['', 'NULL', 'NaN']
+# spellings of a true boolean flag, compared after strip() and lower()
+TRUE_VALUES = frozenset({'1', 'true', 'yes', 'y', 't'})
+DATE_FORMAT = '%Y-%m-%d'
+
+# Columnar accessors: a column missing from the CSV reads as all-NA, like row.get() did
+def column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+def numeric_column(df, name):
+    """float64 array; empty or unparseable cells become NaN."""
+    return pd.to_numeric(column(df, name), errors='coerce').to_numpy(dtype='float64')
+
+def integer_column(df, name):
+    """float64 array of whole numbers; empty, unparseable or non-integral cells become NaN (int() rejected them too)."""
+    values = numeric_column(df, name)
+    return np.where(np.isfinite(values) & (values == np.floor(values)), values, np.nan)
+
+def text_column(df, name, default=None):
+    """object array; NA cells become `default`."""
+    values = column(df, name)
+    return values.astype(object).where(values.notna(), default).to_numpy()
+
+def date_column(df, name):
+    """object array of datetime.date; empty or unparseable cells become None."""
+    raw = column(df, name)
+    parsed = pd.to_datetime(raw, format=DATE_FORMAT, errors='coerce')
+    if (parsed.isna() & raw.notna()).any():
+        # some cells use another layout: parse each cell on its own, as before
+        parsed = pd.to_datetime(raw, format='mixed', errors='coerce')
+    return parsed.dt.date.astype(object).where(parsed.notna(), None).to_numpy()
+
+def known_mask(values, keys):
+    """bool array: which of `values` are in the `keys` set; NaN/None never are."""
+    return pd.Series(values).isin(keys).to_numpy()
+
+def nullable_ints(values, mask):
+    """Int64 array of `values` where `mask` holds, NA elsewhere."""
+    return pd.array(np.where(mask, values, np.nan), dtype='Int64')
 
 class CSVLoader:
     """
@@ -32,6 +80,32 @@ class CSVLoader:
         'shippers': 'shippers.csv',
     }
 
+    # column types for the typed pyarrow read of the tables loaded whole (see CHUNKED)
+    DTYPES = {
+        'categories': {'categoryID': 'int64[pyarrow]', 'categoryName': 'string[pyarrow]',
+                       'description': 'string[pyarrow]'},
+        'customers': {'customerID': 'string[pyarrow]', 'companyName': 'string[pyarrow]',
+                      'contactName': 'string[pyarrow]', 'contactTitle': 'string[pyarrow]',
+                      'city': 'string[pyarrow]', 'country': 'string[pyarrow]'},
+        'employees': {'employeeID': 'int64[pyarrow]', 'employeeName': 'string[pyarrow]',
+                      'title': 'string[pyarrow]', 'city': 'string[pyarrow]',
+                      'country': 'string[pyarrow]', 'reportsTo': 'int64[pyarrow]'},
+        'products': {'productID': 'int64[pyarrow]', 'productName': 'string[pyarrow]',
+                     'quantityPerUnit': 'string[pyarrow]', 'unitPrice': 'float64[pyarrow]',
+                     'discontinued': 'string[pyarrow]', 'categoryID': 'int64[pyarrow]'},
+        'shippers': {'shipperID': 'int64[pyarrow]', 'companyName': 'string[pyarrow]'},
+    }
+
+    # order matters: parents first
+    INSERT_ORDER = ('categories', 'customers', 'employees', 'shippers', 'products', 'orders', 'order_details')
+
+    # rows per INSERT statement for bulk_create
+    BATCH_SIZE = 1000
+
+    # the large tables are streamed in chunks of CHUNKSIZE rows rather than read whole
+    CHUNKED = ('orders', 'order_details')
+    CHUNKSIZE = 50_000
+
     def __init__(self, csv_root=None, create_missing_parents=False):
         self.csv_root = csv_root or getattr(settings, 'CSV_ROOT', None)
         if not self.csv_root:
@@ -46,58 +120,65 @@ class CSVLoader:
             'null_counts': {},
         }
 
-    def _load_df(self, filename, **kwargs):
+    def _load_df(self, filename, dtype_map=None, chunksize=None, **kwargs):
         path = os.path.join(self.csv_root, filename)
         if not os.path.exists(path):
             raise FileNotFoundError(f"CSV not found: {path}")
-        df = pd.read_csv(path, dtype=str, encoding="ISO-8859-1",keep_default_na=False, na_values=['', 'NULL', 'NaN'])
+        if chunksize:
+            # the pyarrow engine can't stream, so chunked reads use the C parser
+            return pd.read_csv(path, dtype=str, encoding="ISO-8859-1", keep_default_na=False,
+                               na_values=NA_VALUES, chunksize=chunksize)
+        if pa is not None and dtype_map:
+            try:
+                return pd.read_csv(path, engine='pyarrow', dtype_backend='pyarrow', dtype=dtype_map,
+                                   encoding="ISO-8859-1", keep_default_na=False, na_values=NA_VALUES)
+            except ValueError:
+                # a cell doesn't fit its declared type; read as strings and let the column coercion flag it
+                pass
+        df = pd.read_csv(path, dtype=str, encoding="ISO-8859-1",keep_default_na=False, na_values=NA_VALUES)
         return df
 
-    def _count_nulls(self, df):
-        # count empty/NA cells
-        return int(df.isnull().sum().sum())
+    def _load_df_with_nulls(self, name):
+        # count empty/NA cells in the reader thread, straight off the ndarray
+        df = self._load_df(self.DEFAULT_FILENAMES[name], dtype_map=self.DTYPES.get(name))
+        return df, int(df.isna().to_numpy().sum())
+
+    def _tally(self, name, df, report):
+        # running processed/null counts for tables that are read in chunks
+        report['processed'][name] += len(df)
+        report['null_counts'][name] += int(df.isna().to_numpy().sum())
 
     def run(self):
         start = time.time()
         report = self.metrics
         try:
-            # load files (order matters: parents first)
-            categories_df = self._load_df(self.DEFAULT_FILENAMES['categories'])
-            report['processed']['categories'] = len(categories_df)
-            report['null_counts']['categories'] = self._count_nulls(categories_df)
-
-            customers_df = self._load_df(self.DEFAULT_FILENAMES['customers'])
-            report['processed']['customers'] = len(customers_df)
-            report['null_counts']['customers'] = self._count_nulls(customers_df)
-
-            employees_df = self._load_df(self.DEFAULT_FILENAMES['employees'])
-            report['processed']['employees'] = len(employees_df)
-            report['null_counts']['employees'] = self._count_nulls(employees_df)
-
-            shippers_df = self._load_df(self.DEFAULT_FILENAMES['shippers'])
-            report['processed']['shippers'] = len(shippers_df)
-            report['null_counts']['shippers'] = self._count_nulls(shippers_df)
-
-            products_df = self._load_df(self.DEFAULT_FILENAMES['products'])
-            report['processed']['products'] = len(products_df)
-            report['null_counts']['products'] = self._count_nulls(products_df)
-
-            orders_df = self._load_df(self.DEFAULT_FILENAMES['orders'])
-            report['processed']['orders'] = len(orders_df)
-            report['null_counts']['orders'] = self._count_nulls(orders_df)
-
-            order_details_df = self._load_df(self.DEFAULT_FILENAMES['order_details'])
-            report['processed']['order_details'] = len(order_details_df)
-            report['null_counts']['order_details'] = self._count_nulls(order_details_df)
-
-            # validate & insert in DB using transactions and bulk ops
-            self._insert_categories(categories_df, report)
-            self._insert_customers(customers_df, report)
-            self._insert_employees(employees_df, report)
-            self._insert_shippers(shippers_df, report)
-            self._insert_products(products_df, report)
-            self._insert_orders(orders_df, report)
-            self._insert_order_details(order_details_df, report)
+            # read files concurrently (pandas releases the GIL while parsing);
+            # only the inserts below need parents-first ordering
+            whole = [name for name in self.DEFAULT_FILENAMES if name not in self.CHUNKED]
+            with ThreadPoolExecutor(max_workers=len(whole)) as pool:
+                futures = {name: pool.submit(self._load_df_with_nulls, name) for name in whole}
+                dfs = {}
+                for name in self.INSERT_ORDER:
+                    if name in self.CHUNKED:
+                        # tallied chunk by chunk during the insert
+                        report['processed'][name] = report['null_counts'][name] = 0
+                        continue
+                    dfs[name], report['null_counts'][name] = futures[name].result()
+                    report['processed'][name] = len(dfs[name])
+
+            # validate & insert in DB using a single transaction and bulk ops
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    # check FKs once at commit; the load is re-runnable, so don't wait on the WAL flush
+                    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+                    cursor.execute('SET LOCAL synchronous_commit = off')
+                for name in self.INSERT_ORDER:
+                    insert = getattr(self, f'_insert_{name}')
+                    if name in self.CHUNKED:
+                        with self._load_df(self.DEFAULT_FILENAMES[name], chunksize=self.CHUNKSIZE) as chunks:
+                            insert(chunks, report)
+                    else:
+                        insert(dfs[name], report)
 
         except Exception as e:
             # catch-all: record error and re-raise
@@ -109,259 +190,237 @@ class CSVLoader:
             report['duration_seconds'] = end - start
         return report
 
-    # Insert helpers: each does validation and uses bulk_create
+    def _copy_insert(self, model, frame, check_parents=()):
+        """
+        Stream `frame` (columns named after model fields) into the model's table with COPY through a temp staging table,
+        then move them over with ON CONFLICT DO NOTHING (the COPY equivalent of
+        bulk_create(ignore_conflicts=True)). Postgres only.
+        Rows whose `check_parents` FKs don't match a parent row are left out; returns how many were.
+        """
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        # pg_temp: the DROP must never resolve to a permanent table of that name through search_path
+        stage = f"pg_temp.{qn(f'_stage_{model._meta.db_table}')}"
+        columns = ', '.join(qn(model._meta.get_field(name).column) for name in frame.columns)
+        fks = [model._meta.get_field(name) for name in check_parents]
+        parents_exist = ' AND '.join(
+            f'EXISTS (SELECT 1 FROM {qn(fk.related_model._meta.db_table)} p '
+            f'WHERE p.{qn(fk.target_field.column)} = s.{qn(fk.column)})'
+            for fk in fks) or 'TRUE'
+        buf = io.StringIO()
+        frame.to_csv(buf, index=False, header=False, na_rep='\\N')
+        buf.seek(0)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {stage}')
+            cursor.execute(f'CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA')
+            cursor.copy_expert(f"COPY {stage} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf)
+            missing_parents = 0
+            if fks:
+                cursor.execute(f'SELECT count(*) FROM {stage} s WHERE NOT ({parents_exist})')
+                missing_parents = cursor.fetchone()[0]
+            cursor.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} s '
+                           f'WHERE {parents_exist} ON CONFLICT DO NOTHING')
+        return missing_parents
+
+    # Insert helpers: each does validation and uses bulk_create (COPY for the large tables)
     def _insert_categories(self, df, report):
         created = 0
-        errors = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                cat_id = int(row.get('categoryID')) if row.get('categoryID') else None
-                if cat_id is None:
-                    errors += 1
-                    continue
-                objs.append(models.Category(categoryID=cat_id,
-                                           categoryName=row.get('categoryName') or '',
-                                           description=row.get('description') or None))
-            except Exception:
-                errors += 1
+        ids = integer_column(df, 'categoryID')
+        valid = ~np.isnan(ids)
+        names = text_column(df, 'categoryName', default='')
+        descriptions = text_column(df, 'description')
+        objs = [models.Category(categoryID=int(cat_id), categoryName=name, description=desc)
+                for cat_id, name, desc in zip(ids[valid], names[valid], descriptions[valid])]
         if objs:
-            models.Category.objects.bulk_create(objs, ignore_conflicts=True)
+            models.Category.objects.bulk_create(objs, ignore_conflicts=True, batch_size=self.BATCH_SIZE)
             created = len(objs)
         report['inserted']['categories'] = created
-        report['errors']['categories'] = errors
+        report['errors']['categories'] = int((~valid).sum())
 
     def _insert_customers(self, df, report):
         created = 0
-        errors = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                cid = row.get('customerID')
-                if not cid:
-                    errors += 1; continue
-                objs.append(models.Customer(
-                    customerID=cid,
-                    companyName=row.get('companyName') or '',
-                    contactName=row.get('contactName') or None,
-                    contactTitle=row.get('contactTitle') or None,
-                    city=row.get('city') or None,
-                    country=row.get('country') or None
-                ))
-            except Exception:
-                errors += 1
+        ids = text_column(df, 'customerID')
+        valid = pd.notna(ids)
+        company_names = text_column(df, 'companyName', default='')
+        contact_names = text_column(df, 'contactName')
+        contact_titles = text_column(df, 'contactTitle')
+        cities = text_column(df, 'city')
+        countries = text_column(df, 'country')
+        objs = [models.Customer(customerID=cid, companyName=company, contactName=contact,
+                                contactTitle=contact_title, city=city, country=country)
+                for cid, company, contact, contact_title, city, country in zip(
+                    ids[valid], company_names[valid], contact_names[valid],
+                    contact_titles[valid], cities[valid], countries[valid])]
         if objs:
-            models.Customer.objects.bulk_create(objs, ignore_conflicts=True)
+            models.Customer.objects.bulk_create(objs, ignore_conflicts=True, batch_size=self.BATCH_SIZE)
             created = len(objs)
         report['inserted']['customers'] = created
-        report['errors']['customers'] = errors
+        report['errors']['customers'] = int((~valid).sum())
 
     def _insert_employees(self, df, report):
         """
         Two-pass insert: create employees without reportsTo, then update reportsTo FK to existing records.
         """
-        created = 0; errors = 0
-        temp_relations = []
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                eid = int(row.get('employeeID')) if row.get('employeeID') else None
-                if eid is None:
-                    errors += 1; continue
-                reports_to_raw = row.get('reportsTo') or None
-                objs.append(models.Employee(employeeID=eid,
-                                           employeeName=row.get('employeeName') or '',
-                                           title=row.get('title') or None,
-                                           city=row.get('city') or None,
-                                           country=row.get('country') or None,
-                                           reportsTo=None))
-                temp_relations.append((eid, reports_to_raw))
-            except Exception:
-                errors += 1
+        created = 0
+        ids = integer_column(df, 'employeeID')
+        valid = ~np.isnan(ids)
+        errors = int((~valid).sum())
+        names = text_column(df, 'employeeName', default='')
+        titles = text_column(df, 'title')
+        cities = text_column(df, 'city')
+        countries = text_column(df, 'country')
+        reports_to = integer_column(df, 'reportsTo')
+        objs = [models.Employee(employeeID=int(eid), employeeName=name, title=title,
+                                city=city, country=country, reportsTo=None)
+                for eid, name, title, city, country in zip(
+                    ids[valid], names[valid], titles[valid], cities[valid], countries[valid])]
         if objs:
-            models.Employee.objects.bulk_create(objs, ignore_conflicts=True)
+            models.Employee.objects.bulk_create(objs, ignore_conflicts=True, batch_size=self.BATCH_SIZE)
             created = len(objs)
-        # second pass: set reportsTo where possible
-        rel_errors = 0
-        for eid, reports_to_raw in temp_relations:
-            if not reports_to_raw:
-                continue
-            try:
-                reports_to_id = int(reports_to_raw)
-                try:
-                    manager = models.Employee.objects.get(pk=reports_to_id)
-                    emp = models.Employee.objects.get(pk=eid)
-                    emp.reportsTo = manager
-                    emp.save(update_fields=['reportsTo'])
-                except models.Employee.DoesNotExist:
-                    rel_errors += 1
-            except Exception:
-                rel_errors += 1
+        # second pass: set reportsTo where the manager exists
+        known_employees = set(models.Employee.objects.values_list('employeeID', flat=True))
+        has_manager = valid & ~np.isnan(reports_to)
+        manager_known = has_manager & known_mask(reports_to, known_employees)
+        updates = [models.Employee(employeeID=int(eid), reportsTo_id=int(rt))
+                   for eid, rt in zip(ids[manager_known], reports_to[manager_known])]
+        if updates:
+            models.Employee.objects.bulk_update(updates, ['reportsTo'], batch_size=self.BATCH_SIZE)
+        # a reportsTo that is present but not an integer can never resolve
+        bad_manager = valid & column(df, 'reportsTo').notna().to_numpy() & np.isnan(reports_to)
+        rel_errors = int((has_manager & ~manager_known).sum() + bad_manager.sum())
         report['inserted']['employees'] = created
         report['errors']['employees'] = errors + rel_errors
         report['referential_violations']['employees_reportsTo_missing'] = rel_errors
 
     def _insert_shippers(self, df, report):
-        created = 0; errors = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                sid = int(row.get('shipperID')) if row.get('shipperID') else None
-                if sid is None:
-                    errors += 1; continue
-                objs.append(models.Shipper(shipperID=sid, companyName=row.get('companyName') or ''))
-            except Exception:
-                errors += 1
+        created = 0
+        ids = integer_column(df, 'shipperID')
+        valid = ~np.isnan(ids)
+        names = text_column(df, 'companyName', default='')
+        objs = [models.Shipper(shipperID=int(sid), companyName=name)
+                for sid, name in zip(ids[valid], names[valid])]
         if objs:
-            models.Shipper.objects.bulk_create(objs, ignore_conflicts=True)
+            models.Shipper.objects.bulk_create(objs, ignore_conflicts=True, batch_size=self.BATCH_SIZE)
             created = len(objs)
         report['inserted']['shippers'] = created
-        report['errors']['shippers'] = errors
+        report['errors']['shippers'] = int((~valid).sum())
 
     def _insert_products(self, df, report):
-        created = 0; errors = 0; ref_violations = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                pid = int(row.get('productID')) if row.get('productID') else None
-                if pid is None:
-                    errors += 1; continue
-                cat_raw = row.get('categoryID')
-                cat_obj = None
-                if cat_raw:
-                    try:
-                        cat_id = int(cat_raw)
-                        cat_obj = models.Category.objects.filter(pk=cat_id).first()
-                        if not cat_obj and self.create_missing_parents:
-                            cat_obj = models.Category.objects.create(categoryID=cat_id, categoryName=f'Auto-{cat_id}')
-                        if not cat_obj:
-                            ref_violations += 1
-                    except Exception:
-                        ref_violations += 1
-                discontinued_flag = False
-                disc = row.get('discontinued')
-                if str(disc).strip().lower() in ['1', 'true', 'yes', 'y']:
-                    discontinued_flag = True
-                unit_price = None
-                try:
-                    up = row.get('unitPrice')
-                    unit_price = float(up) if up not in (None, '', 'NA', 'NaN') else None
-                except Exception:
-                    unit_price = None
-                objs.append(models.Product(
-                    productID=pid,
-                    productName=row.get('productName') or '',
-                    quantityPerUnit=row.get('quantityPerUnit') or None,
-                    unitPrice=unit_price,
-                    discontinued=discontinued_flag,
-                    category=cat_obj
-                ))
-            except Exception:
-                errors += 1
+        created = 0; ref_violations = 0
+        ids = integer_column(df, 'productID')
+        valid = ~np.isnan(ids)
+        names = text_column(df, 'productName', default='')
+        quantities = text_column(df, 'quantityPerUnit')
+        prices = numeric_column(df, 'unitPrice')
+        discontinued = (column(df, 'discontinued').astype(str).str.strip().str.lower()
+                        .isin(TRUE_VALUES).to_numpy())
+        cat_ids = integer_column(df, 'categoryID')
+        # a categoryID that is present but not an integer can never resolve
+        ref_violations += int((column(df, 'categoryID').notna().to_numpy() & np.isnan(cat_ids))[valid].sum())
+        known_categories = set(models.Category.objects.values_list('categoryID', flat=True))
+        referenced = {int(c) for c in cat_ids[valid] if not np.isnan(c)}
+        if self.create_missing_parents and referenced - known_categories:
+            missing = referenced - known_categories
+            models.Category.objects.bulk_create(
+                [models.Category(categoryID=cat_id, categoryName=f'Auto-{cat_id}') for cat_id in missing],
+                ignore_conflicts=True, batch_size=self.BATCH_SIZE)
+            known_categories |= missing
+        has_category = valid & ~np.isnan(cat_ids)
+        category_known = has_category & known_mask(cat_ids, known_categories)
+        ref_violations += int((has_category & ~category_known).sum())
+        objs = [models.Product(productID=int(pid), productName=name, quantityPerUnit=qty,
+                               unitPrice=None if np.isnan(price) else float(price),
+                               discontinued=bool(disc), category_id=int(cat_id) if known else None)
+                for pid, name, qty, price, disc, cat_id, known in zip(
+                    ids[valid], names[valid], quantities[valid], prices[valid],
+                    discontinued[valid], cat_ids[valid], category_known[valid])]
         if objs:
-            models.Product.objects.bulk_create(objs, ignore_conflicts=True)
+            models.Product.objects.bulk_create(objs, ignore_conflicts=True, batch_size=self.BATCH_SIZE)
             created = len(objs)
         report['inserted']['products'] = created
-        report['errors']['products'] = errors
+        report['errors']['products'] = int((~valid).sum())
         report['referential_violations']['products_category_missing'] = ref_violations
 
-    def _insert_orders(self, df, report):
+    def _insert_orders(self, chunks, report):
         created = 0; errors = 0; ref_violations = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                oid = int(row.get('orderID')) if row.get('orderID') else None
-                if oid is None:
-                    errors += 1; continue
-                cust_raw = row.get('customerID')
-                cust_obj = None
-                if cust_raw:
-                    cust_obj = models.Customer.objects.filter(pk=cust_raw).first()
-                    if not cust_obj and self.create_missing_parents:
-                        # create a minimal customer
-                        cust_obj = models.Customer.objects.create(customerID=cust_raw, companyName=f'Auto-{cust_raw}')
-                    if not cust_obj:
-                        ref_violations += 1
-                emp_obj = None
-                emp_raw = row.get('employeeID')
-                if emp_raw:
-                    try:
-                        emp_obj = models.Employee.objects.filter(pk=int(emp_raw)).first()
-                        if not emp_obj:
-                            ref_violations += 1
-                    except Exception:
-                        ref_violations += 1
-                shipper_obj = None
-                s_raw = row.get('shipperID')
-                if s_raw:
-                    try:
-                        shipper_obj = models.Shipper.objects.filter(pk=int(s_raw)).first()
-                        if not shipper_obj:
-                            ref_violations += 1
-                    except Exception:
-                        ref_violations += 1
-
-                order_date = parse_date_safe(row.get('orderDate'))
-                required_date = parse_date_safe(row.get('requiredDate'))
-                shipped_date = parse_date_safe(row.get('shippedDate'))
-                freight = None
-                try:
-                    freight = float(row.get('freight')) if row.get('freight') not in (None, '', 'NaN') else None
-                except Exception:
-                    freight = None
-
-                objs.append(models.Order(
-                    orderID=oid,
-                    customer=cust_obj,
-                    employee=emp_obj,
-                    orderDate=order_date,
-                    requiredDate=required_date,
-                    shippedDate=shipped_date,
-                    shipper=shipper_obj,
-                    freight=freight
-                ))
-            except Exception:
-                errors += 1
-
-        if objs:
-            models.Order.objects.bulk_create(objs, ignore_conflicts=True)
-            created = len(objs)
+        known_customers = set(models.Customer.objects.values_list('customerID', flat=True))
+        known_employees = set(models.Employee.objects.values_list('employeeID', flat=True))
+        known_shippers = set(models.Shipper.objects.values_list('shipperID', flat=True))
+        for df in chunks:
+            self._tally('orders', df, report)
+            ids = integer_column(df, 'orderID')
+            valid = ~np.isnan(ids)
+            customer_ids = text_column(df, 'customerID')
+            employee_ids = integer_column(df, 'employeeID')
+            shipper_ids = integer_column(df, 'shipperID')
+            for name, coerced in (('employeeID', employee_ids), ('shipperID', shipper_ids)):
+                ref_violations += int((column(df, name).notna().to_numpy() & np.isnan(coerced))[valid].sum())
+            order_dates = date_column(df, 'orderDate')
+            required_dates = date_column(df, 'requiredDate')
+            shipped_dates = date_column(df, 'shippedDate')
+            freights = numeric_column(df, 'freight')
+            referenced = {cid for cid in customer_ids[valid] if cid is not None}
+            if self.create_missing_parents and referenced - known_customers:
+                # create minimal customers
+                missing = referenced - known_customers
+                models.Customer.objects.bulk_create(
+                    [models.Customer(customerID=cid, companyName=f'Auto-{cid}') for cid in missing],
+                    ignore_conflicts=True, batch_size=self.BATCH_SIZE)
+                known_customers |= missing
+            has_customer = valid & pd.notna(customer_ids)
+            customer_known = has_customer & known_mask(customer_ids, known_customers)
+            has_employee = valid & ~np.isnan(employee_ids)
+            employee_known = has_employee & known_mask(employee_ids, known_employees)
+            has_shipper = valid & ~np.isnan(shipper_ids)
+            shipper_known = has_shipper & known_mask(shipper_ids, known_shippers)
+            ref_violations += int((has_customer & ~customer_known).sum()
+                                  + (has_employee & ~employee_known).sum()
+                                  + (has_shipper & ~shipper_known).sum())
+            frame = pd.DataFrame({
+                'orderID': nullable_ints(ids, valid),
+                'customer': np.where(customer_known, customer_ids, None),
+                'employee': nullable_ints(employee_ids, employee_known),
+                'orderDate': order_dates,
+                'requiredDate': required_dates,
+                'shippedDate': shipped_dates,
+                'shipper': nullable_ints(shipper_ids, shipper_known),
+                'freight': freights,
+            })[valid]
+            if len(frame):
+                self._copy_insert(models.Order, frame)
+                created += len(frame)
+            errors += int((~valid).sum())
         report['inserted']['orders'] = created
         report['errors']['orders'] = errors
         report['referential_violations']['orders_missing_refs'] = ref_violations
 
-    def _insert_order_details(self, df, report):
+    def _insert_order_details(self, chunks, report):
         created = 0; errors = 0; ref_violations = 0
-        objs = []
-        for _, row in df.iterrows():
-            try:
-                oid = int(row.get('orderID')) if row.get('orderID') else None
-                pid = int(row.get('productID')) if row.get('productID') else None
-                if oid is None or pid is None:
-                    errors += 1; continue
-                order_obj = models.Order.objects.filter(pk=oid).first()
-                product_obj = models.Product.objects.filter(pk=pid).first()
-                if not order_obj or not product_obj:
-                    ref_violations += 1
-                    # skip or create behavior configurable
-                    if not (order_obj and product_obj):
-                        continue
-                unit_price = float(row.get('unitPrice')) if row.get('unitPrice') not in (None, '', 'NaN') else 0.0
-                quantity = int(row.get('quantity')) if row.get('quantity') not in (None, '', 'NaN') else 0
-                discount = float(row.get('discount')) if row.get('discount') not in (None, '', 'NaN') else 0.0
-                objs.append(models.OrderDetail(
-                    order=order_obj,
-                    product=product_obj,
-                    unitPrice=unit_price,
-                    quantity=quantity,
-                    discount=discount
-                ))
-            except Exception:
-                errors += 1
-        if objs:
-            # bulk_create could violate unique_together if duplicates exist — ignore_conflicts helps (supported by Postgres)
-            models.OrderDetail.objects.bulk_create(objs, ignore_conflicts=True)
-            created = len(objs)
+        for df in chunks:
+            self._tally('order_details', df, report)
+            order_ids = integer_column(df, 'orderID')
+            product_ids = integer_column(df, 'productID')
+            valid = ~(np.isnan(order_ids) | np.isnan(product_ids))
+            amounts = {}
+            for name in ('unitPrice', 'quantity', 'discount'):
+                values = integer_column(df, name) if name == 'quantity' else numeric_column(df, name)
+                # empty cells default to 0; a cell that is present but not numeric (or a fractional quantity) makes the row an error
+                valid &= ~(column(df, name).notna().to_numpy() & np.isnan(values))
+                amounts[name] = np.nan_to_num(values, nan=0.0)
+            frame = pd.DataFrame({
+                'order': order_ids[valid].astype('int64'),
+                'product': product_ids[valid].astype('int64'),
+                'unitPrice': amounts['unitPrice'][valid],
+                'quantity': amounts['quantity'][valid].astype('int64'),
+                'discount': amounts['discount'][valid],
+            })
+            if len(frame):
+                # rows with a missing order/product are skipped in SQL (skip or create behavior configurable);
+                # duplicates of unique_together (order, product) are skipped by ON CONFLICT DO NOTHING
+                missing = self._copy_insert(models.OrderDetail, frame, check_parents=('order', 'product'))
+                ref_violations += missing
+                created += len(frame) - missing
+            errors += int((~valid).sum())
         report['inserted']['order_details'] = created
         report['errors']['order_details'] = errors
         report['referential_violations']['order_details_missing_refs'] = ref_violations
@@ -381,5 +440,9 @@ class Command(BaseCommand):
         self.stdout.write("Starting CSV normalization pipeline...")
         report = loader.run()
         self.stdout.write(self.style.SUCCESS("Done. Report:"))
-        import json
-        self.stdout.write(json.dumps(report, default=str, indent=2))
\ No newline at end of file
+        if orjson is not None:
+            # passthrough keeps datetimes going through str(), same output as the json fallback
+            self.stdout.write(orjson.dumps(
+                report, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME).decode())
+        else:
+            self.stdout.write(json.dumps(report, default=str, indent=2))
@@ -1,3 +1,142 @@
-from django.test import TestCase
+import datetime
+import io
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from data_loader import models
+from data_loader.management.commands.load_csvs import (
+    NA_VALUES, CSVLoader, date_column, integer_column, known_mask, numeric_column, text_column,
+)
+
+
+def read_csv(text):
+    """DataFrame read the way CSVLoader reads the chunked tables (all str, blanks as NA)."""
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False, na_values=NA_VALUES)
+
+
+def empty_report():
+    return {'processed': {'orders': 0, 'order_details': 0}, 'null_counts': {'orders': 0, 'order_details': 0},
+            'inserted': {}, 'errors': {}, 'referential_violations': {}}
+
+
+class ColumnCoercionTests(SimpleTestCase):
+    def test_integer_column_rejects_junk_and_fractions(self):
+        df = read_csv("id,n\n1,a\n2.0,b\n10249.5,c\nabc,d\n,e\ninf,f\n")
+        np.testing.assert_array_equal(integer_column(df, 'id'), [1, 2, np.nan, np.nan, np.nan, np.nan])
+
+    def test_missing_column_reads_as_na(self):
+        df = read_csv("id\n1\n2\n")
+        self.assertTrue(np.isnan(integer_column(df, 'other')).all())
+        self.assertTrue(np.isnan(numeric_column(df, 'other')).all())
+        self.assertEqual(list(text_column(df, 'other', default='')), ['', ''])
+        self.assertEqual(list(date_column(df, 'other')), [None, None])
+
+    def test_text_column_default(self):
+        df = read_csv("name,n\nAna,a\n,b\nNULL,c\n")
+        self.assertEqual(list(text_column(df, 'name', default='')), ['Ana', '', ''])
+        self.assertEqual(list(text_column(df, 'name')), ['Ana', None, None])
+
+    def test_date_column_mixed_formats(self):
+        df = read_csv("d,n\n1996-07-04,a\n07/05/1996,b\n,c\nnot a date,d\n")
+        self.assertEqual(list(date_column(df, 'd')),
+                         [datetime.date(1996, 7, 4), datetime.date(1996, 7, 5), None, None])
+
+    def test_known_mask_never_matches_missing_values(self):
+        np.testing.assert_array_equal(known_mask(np.array([1.0, np.nan, 3.0]), {1, 3}), [True, False, True])
+        np.testing.assert_array_equal(known_mask(np.array(['A', None], dtype=object), {'A'}), [True, False])
+
+
+class InsertTests(SimpleTestCase):
+    """The _insert_* helpers with parent key sets and the COPY step stubbed out (no database)."""
+
+    def setUp(self):
+        self.loader = CSVLoader(csv_root='unused')
+        self.report = empty_report()
+
+    def stub_keys(self, model, keys):
+        patcher = mock.patch.object(model.objects, 'values_list', return_value=list(keys))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stub_copy(self, missing_parents=0):
+        patcher = mock.patch.object(CSVLoader, '_copy_insert', return_value=missing_parents)
+        copy = patcher.start()
+        self.addCleanup(patcher.stop)
+        return copy
+
+    def test_orders(self):
+        self.stub_keys(models.Customer, ['ALFKI'])
+        self.stub_keys(models.Employee, [1])
+        self.stub_keys(models.Shipper, [1])
+        copy = self.stub_copy()
+        # no shipperID / freight columns at all
+        df = read_csv("orderID,customerID,employeeID,orderDate\n"
+                      "1,ALFKI,1,1996-07-04\n"
+                      "2,NOPE,1,07/05/1996\n"
+                      "3,ALFKI,1.5,\n"
+                      "4.5,ALFKI,1,1996-07-04\n"
+                      "abc,ALFKI,1,1996-07-04\n")
+        self.loader._insert_orders([df], self.report)
+
+        self.assertEqual(self.report['processed']['orders'], 5)
+        self.assertEqual(self.report['inserted']['orders'], 3)
+        self.assertEqual(self.report['errors']['orders'], 2)
+        # unknown customer NOPE, non-integral employee 1.5
+        self.assertEqual(self.report['referential_violations']['orders_missing_refs'], 2)
+        (model, frame), kwargs = copy.call_args
+        self.assertIs(model, models.Order)
+        self.assertEqual(kwargs, {})
+        self.assertEqual(list(frame['orderID']), [1, 2, 3])
+        self.assertEqual(list(frame['customer']), ['ALFKI', None, 'ALFKI'])
+        self.assertEqual(list(frame['employee'].isna()), [False, False, True])
+        self.assertEqual(list(frame['employee'][:2]), [1, 1])
+        self.assertTrue(frame['shipper'].isna().all())
+        self.assertEqual(list(frame['orderDate']), [datetime.date(1996, 7, 4), datetime.date(1996, 7, 5), None])
+
+    def test_order_details(self):
+        copy = self.stub_copy(missing_parents=1)
+        df = read_csv("orderID,productID,unitPrice,quantity,discount\n"
+                      "10248,11,14.0,12,0.1\n"
+                      "10249.5,11,1,1,0\n"
+                      "10250,42,,,\n"
+                      "10251,42,abc,1,0\n"
+                      "10252,42,1,2.5,0\n"
+                      "10253,42,1,1,n/a\n"
+                      "x,42,1,1,0\n")
+        self.loader._insert_order_details([df], self.report)
+
+        # blank amounts default to 0; junk amounts, fractional quantities and bad IDs are errors
+        self.assertEqual(self.report['errors']['order_details'], 5)
+        self.assertEqual(self.report['referential_violations']['order_details_missing_refs'], 1)
+        self.assertEqual(self.report['inserted']['order_details'], 1)
+        (model, frame), kwargs = copy.call_args
+        self.assertIs(model, models.OrderDetail)
+        self.assertEqual(kwargs, {'check_parents': ('order', 'product')})
+        self.assertEqual(list(frame['order']), [10248, 10250])
+        self.assertEqual(list(frame['product']), [11, 42])
+        self.assertEqual(list(frame['unitPrice']), [14.0, 0.0])
+        self.assertEqual(list(frame['quantity']), [12, 0])
+        self.assertEqual(list(frame['discount']), [0.1, 0.0])
+
+    def test_employees_reports_to(self):
+        self.stub_keys(models.Employee, [1, 2, 3, 4])
+        with mock.patch.object(models.Employee.objects, 'bulk_create') as bulk_create, \
+                mock.patch.object(models.Employee.objects, 'bulk_update') as bulk_update:
+            df = read_csv("employeeID,employeeName,reportsTo\n"
+                          "1,Ana,\n"
+                          "2,Bo,1\n"
+                          "3,Cy,99\n"
+                          "4,Di,abc\n"
+                          "5.5,Ed,1\n")
+            self.loader._insert_employees(df, self.report)
+
+        self.assertEqual([e.employeeID for e in bulk_create.call_args.args[0]], [1, 2, 3, 4])
+        updates = bulk_update.call_args.args[0]
+        self.assertEqual([(e.employeeID, e.reportsTo_id) for e in updates], [(2, 1)])
+        self.assertEqual(self.report['inserted']['employees'], 4)
+        # unknown manager 99 and non-numeric abc
+        self.assertEqual(self.report['referential_violations']['employees_reportsTo_missing'], 2)
+        self.assertEqual(self.report['errors']['employees'], 3)
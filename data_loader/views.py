@@ -1,5 +1,7 @@
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework import status
 from .serializers import PipelineRunSerializer, MetricsSerializer
 from django.conf import settings
@@ -17,14 +19,14 @@ class RunPipelineView(APIView):
 
         loader = CSVLoader(csv_root=csv_root, create_missing_parents=create_missing)
         report = loader.run()
-        # store last run
+        # store last run; metrics only change here, so render them once instead of on every GET
         LAST_RUN['report'] = report
+        LAST_RUN['metrics_json'] = JSONRenderer().render(MetricsSerializer(report).data)
         return Response(report, status=status.HTTP_200_OK)
 
 class MetricsView(APIView):
     def get(self, request):
-        report = LAST_RUN.get('report')
-        if not report:
+        metrics_json = LAST_RUN.get('metrics_json')
+        if not metrics_json:
             return Response({'detail': 'No run found'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = MetricsSerializer(report)
-        return Response(serializer.data)
\ No newline at end of file
+        return HttpResponse(metrics_json, content_type='application/json')
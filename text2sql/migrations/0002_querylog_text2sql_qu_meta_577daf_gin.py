@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-15 03:13
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('text2sql', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='querylog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['meta'], name='text2sql_qu_meta_577daf_gin'),
+        ),
+    ]
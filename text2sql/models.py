@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import JSONField
 
@@ -14,5 +15,10 @@ class QueryLog(models.Model):
     error = models.TextField(blank=True, null=True)
     meta = JSONField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['meta']),
+        ]
+
     def __str__(self):
         return f"QueryLog #{self.id} {self.status}"
\ No newline at end of file
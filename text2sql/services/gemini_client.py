@@ -1,3 +1,4 @@
+import logging
 import os
 import google.generativeai as genai
 from text2sql.services.schema_helper import get_schema_context
@@ -11,6 +12,8 @@ if not API_KEY:
 
 genai.configure(api_key=API_KEY)
 
+logger = logging.getLogger(__name__)
+
 
 class GeminiWrapper:
     """
@@ -25,13 +28,27 @@ class GeminiWrapper:
     def __init__(self, model: str = "gemini-2.5-flash"):
         self.model = model
         self.model_client = genai.GenerativeModel(model)
+        # everything before the user question is fixed for a given schema
+        self._prompt_prefix = self._build_prompt_prefix(get_schema_context())
+
+    @staticmethod
+    def _build_prompt_prefix(schema_hint: str) -> str:
+        return (
+            "You are an expert SQL generator for PostgreSQL. "
+            "Always use double quotes for table and column names exactly as in the schema. "
+            "Only produce a single SELECT statement, no semicolons and make the sql in one line. "
+            "Return only SQL, no explanations.\n\n"
+            f"Database schema:\n{schema_hint}\n\n"
+            "User question:\n"
+        )
 
     def nl_to_sql(self, nl_query: str, schema_hint: str = "") -> str:
         """
         Convert a natural language question into a single safe SQL SELECT query.
         Enforces instructions through prompt design.
+        Falls back to the cached model schema when no schema_hint is given.
         """
-        schema_hint = get_schema_context() 
+        prompt_prefix = self._prompt_prefix if not schema_hint else self._build_prompt_prefix(schema_hint)
         # system_prompt = (
         #     "You are an expert SQL generator. "
         #     "Generate ONE valid PostgreSQL SELECT query only. "
@@ -48,14 +65,7 @@ class GeminiWrapper:
         #     "Return only the SQL query, nothing else."
         # )
         
-        system_prompt = (
-            "You are an expert SQL generator for PostgreSQL. "
-            "Always use double quotes for table and column names exactly as in the schema. "
-            "Only produce a single SELECT statement, no semicolons and make the sql in one line. "
-            "Return only SQL, no explanations.\n\n"
-            f"Database schema:\n{schema_hint}\n\n"
-            f"User question:\n{nl_query}\n\n"
-        )
+        system_prompt = prompt_prefix + nl_query + "\n\n"
 
         # try:
         #     response = self.model_client.generate_content(prompt)
@@ -88,5 +98,5 @@ class GeminiWrapper:
         if sql.startswith("```"):
             sql = sql.strip("`").replace("sql", "").strip()
 
-        print(f"Gemini raw response: {sql}")  # for debugging
+        logger.debug("Gemini raw response: %s", sql)
         return sql
\ No newline at end of file
@@ -1,11 +1,17 @@
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
 from django.apps import apps
 from django.db import connection
 
 
+@lru_cache(maxsize=1)
 def get_schema_context():
     """
     Build a simplified schema description for Gemini.
     Lists tables and their columns.
+    Models don't change at runtime, so the result is cached per process.
     """
     schema = []
 
@@ -24,12 +30,21 @@ def get_schema_context():
 def get_live_schema_from_db():
     """
     Uses the actual DB introspection (optional).
+    One catalog query for all tables instead of one description per table.
     """
-    introspection = connection.introspection
     output = []
     with connection.cursor() as cursor:
-        for table in introspection.table_names():
-            columns = introspection.get_table_description(cursor, table)
-            col_names = [col.name for col in columns]
+        cursor.execute(
+            """
+            SELECT c.table_name, c.column_name
+            FROM information_schema.columns c
+            JOIN information_schema.tables t
+              ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+            WHERE c.table_schema = current_schema() AND t.table_type = 'BASE TABLE'
+            ORDER BY c.table_name COLLATE "C", c.ordinal_position
+            """
+        )
+        for table, rows in groupby(cursor.fetchall(), key=itemgetter(0)):
+            col_names = [column for _, column in rows]
             output.append(f"Table: {table}\n  Columns: {', '.join(col_names)}")
-    return "\n\n".join(output)
\ No newline at end of file
+    return "\n\n".join(output)
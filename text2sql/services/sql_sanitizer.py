@@ -3,13 +3,15 @@ Sanitize and validate SQL before execution.
 
 Rules enforced:
  - Only a single statement allowed (no multiple semicolons).
- - Must begin with SELECT (after whitespace / parentheses).
- - Blocked keywords like INSERT/UPDATE/DELETE/CREATE/DROP/ALTER/GRANT.
+ - Must begin with SELECT (after whitespace / parentheses) or WITH.
+ - Blocked keywords like INSERT/UPDATE/DELETE/CREATE/DROP/ALTER/GRANT
+   (inside plain '...' literals and "..." identifiers they're allowed, unless the
+   SQL has comments, dollar quotes or backslashes: then the whole text is checked).
  - Block access to system catalogs (pg_catalog, information_schema).
- - Enforce max rows by injecting LIMIT if none present.
+ - Enforce max rows by injecting LIMIT if the outer query has no LIMIT / FETCH.
 """
 import re
-from django.db import connection
+from django.db import connections
 
 BLOCKED_TOKENS = [
     r"\bINSERT\b", r"\bUPDATE\b", r"\bDELETE\b", r"\bDROP\b",
@@ -19,20 +21,141 @@ BLOCKED_TOKENS = [
 ]
 SYSTEM_TABLES = [r"pg_catalog", r"information_schema"]
 
-SELECT_RE = re.compile(r"^\s*(\(*\s*SELECT\b)", re.IGNORECASE)
+# every blocked token / system table is a whole word, checked by dict lookup
+# against the word tokens of the SQL.
+# uppercased word -> blocked token it came from (None for system tables)
+_BLOCKED_WORDS = {
+    **{p.upper(): None for p in SYSTEM_TABLES},
+    **{token.replace(r"\b", "").upper(): token for token in BLOCKED_TOKENS},
+}
+_SYSTEM_WORDS = frozenset(word for word, token in _BLOCKED_WORDS.items() if token is None)
+WORD_RE = re.compile(r"\w+")
+
 SEMICOLON_RE = re.compile(r";")
-LIMIT_RE = re.compile(r"\bLIMIT\s+\d+\b", re.IGNORECASE)
+
+# DATABASES alias generated SQL runs on (it carries the statement timeout)
+QUERY_DB_ALIAS = "text2sql"
+
+# PostgreSQL lexical tokens, following its scanner (scan.l): only its six whitespace
+# characters, -- comments end at \r or \n, identifiers take any non-ASCII character
+# and $, dollar-quote tags are case-sensitive. Only the opening of a block comment
+# or dollar quote is matched here; tokenize_sql finds where it ends (block comments nest).
+TOKEN_RE = re.compile(
+    r"""
+      (?P<space>[ \t\n\r\f\v]+)
+    | (?P<comment>--[^\r\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<string>[Ee]'(?:[^'\\]|\\.|'')*'|'(?:[^']|'')*')
+    | (?P<dollar_quote>\$(?:[A-Za-z_\x80-\U0010ffff][A-Za-z0-9_\x80-\U0010ffff]*)?\$)
+    | (?P<ident>"(?:[^"]|"")*")
+    | (?P<word>[A-Za-z0-9_\x80-\U0010ffff][A-Za-z0-9_$\x80-\U0010ffff]*)
+    | (?P<other>.)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+BLOCK_COMMENT_RE = re.compile(r"/\*|\*/")
+# constructs where a lexer mismatch could hide code inside a "literal"; when the SQL
+# has any of them, blocked words are looked for in the whole text instead
+_LEXER_CORNER_CASES = ("--", "/*", "$", "\\")
 
 
 class SQLSanitizerError(Exception):
     pass
 
 
+def _block_comment_end(sql: str, start: int):
+    """End of the block comment opened at sql[start] (nested like postgres), or None if unterminated."""
+    depth = 0
+    for m in BLOCK_COMMENT_RE.finditer(sql, start):
+        depth += 1 if m.group() == "/*" else -1
+        if depth == 0:
+            return m.end()
+    return None
+
+
+def tokenize_sql(sql: str):
+    """
+    Split SQL into (kind, text) tokens, dropping whitespace and comments.
+    Words are upper-cased; strings and quoted identifiers keep their case.
+    """
+    tokens = []
+    pos = 0
+    while pos < len(sql):
+        m = TOKEN_RE.match(sql, pos)
+        kind, end = m.lastgroup, m.end()
+        # unterminated ones are rejected (postgres would too) rather than rescanned
+        # to the end of the SQL from every later opener
+        if kind == "block_comment":
+            end = _block_comment_end(sql, pos)
+            if end is None:
+                raise SQLSanitizerError("Unterminated block comment.")
+        elif kind == "dollar_quote":
+            end = sql.find(m.group(), end)
+            if end < 0:
+                raise SQLSanitizerError("Unterminated dollar-quoted string.")
+            kind, end = "string", end + len(m.group())
+        if kind == "word":
+            tokens.append((kind, m.group().upper()))
+        elif kind not in ("space", "comment", "block_comment"):
+            tokens.append((kind, sql[pos:end]))
+        pos = end
+    return tokens
+
+
+def _blocked_word(sql: str, tokens):
+    """First blocked keyword / system table in the SQL, or None."""
+    if any(mark in sql for mark in _LEXER_CORNER_CASES):
+        return next(filter(_BLOCKED_WORDS.__contains__, WORD_RE.findall(sql.upper())), None)
+    # word tokens come upper-cased from tokenize_sql
+    blocked = next((text for kind, text in tokens if kind == "word" and text in _BLOCKED_WORDS), None)
+    if blocked:
+        return blocked
+    # quoted names and literals can still point at a catalog ("pg_catalog".x, 'pg_class'::regclass);
+    # upper-case them all in one go
+    quoted = " ".join(text for kind, text in tokens if kind in ("string", "ident")).upper()
+    return next(filter(_SYSTEM_WORDS.__contains__, WORD_RE.findall(quoted)), None)
+
+
+def _matching_parens(tokens):
+    """Index of the matching ")" for each "(" in tokens, found in one pass."""
+    open_at, matches = [], {}
+    for i, (kind, text) in enumerate(tokens):
+        if text == "(":
+            open_at.append(i)
+        elif text == ")" and open_at:
+            matches[open_at.pop()] = i
+    return matches
+
+
+def _has_outer_limit(tokens):
+    """True if the top-level query (outside any parentheses) has LIMIT n or FETCH FIRST/NEXT."""
+    # "(SELECT ... LIMIT 5)" is itself the top-level query to postgres
+    matches = _matching_parens(tokens)
+    start, stop = 0, len(tokens)
+    while start < stop and matches.get(start) == stop - 1:
+        start, stop = start + 1, stop - 1
+    depth = 0
+    for i in range(start, stop):
+        kind, text = tokens[i]
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif depth == 0 and kind == "word":
+            if text == "FETCH":
+                return True
+            # LIMIT ALL is no limit at all
+            if text == "LIMIT" and tokens[i + 1:i + 2] != [("word", "ALL")]:
+                return True
+    return False
+
+
 def basic_sanitize_and_enforce(sql: str, max_rows: int = 1000) -> str:
-    if not sql or not sql.strip():
+    if not sql or sql.isspace():
         raise SQLSanitizerError("Empty SQL returned from model.")
 
-    cleaned = sql.strip()
+    # LLM output is usually trimmed already; only copy when there's something to strip
+    cleaned = sql.strip() if sql[0].isspace() or sql[-1].isspace() else sql
 
     # Reject multiple statements or any semicolon usage
     if SEMICOLON_RE.search(cleaned):
@@ -40,36 +163,36 @@ def basic_sanitize_and_enforce(sql: str, max_rows: int = 1000) -> str:
         # Safer to reject if there's any semicolon
         raise SQLSanitizerError("Multiple statements or semicolons not allowed.")
 
-    # Block system tables access
-    for p in SYSTEM_TABLES:
-        if re.search(rf"\b{p}\b", cleaned, re.IGNORECASE):
+    # Block system tables access and disallowed tokens
+    tokens = tokenize_sql(cleaned)
+    blocked = _blocked_word(cleaned, tokens)
+    if blocked:
+        token = _BLOCKED_WORDS[blocked]
+        if token is None:
             raise SQLSanitizerError(
                 "Access to system catalogs is not allowed."
             )
+        raise SQLSanitizerError(
+            f"Disallowed SQL operation detected: {token}"
+        )
 
-    # Block disallowed tokens
-    for token in BLOCKED_TOKENS:
-        if re.search(token, cleaned, re.IGNORECASE):
-            raise SQLSanitizerError(
-                f"Disallowed SQL operation detected: {token}"
-            )
-
-    # Must start with SELECT (allow leading parentheses for CTE or subquery)
-    if not SELECT_RE.match(cleaned):
-        # It might be a CTE "WITH ... SELECT" — allow WITH as well
-        if not re.match(r"^\s*WITH\b", cleaned, re.IGNORECASE):
-            raise SQLSanitizerError("Only SELECT queries are allowed.")
+    # Must start with SELECT (allow leading parentheses for subquery) or WITH for a CTE
+    first = next((text for kind, text in tokens if text != "("), None)
+    if first not in ("SELECT", "WITH"):
+        raise SQLSanitizerError("Only SELECT queries are allowed.")
 
-    # Enforce LIMIT
-    if not LIMIT_RE.search(cleaned):
-        cleaned = f"{cleaned.rstrip()} LIMIT {max_rows}"
+    # Enforce LIMIT unless the outer query already has one
+    if not _has_outer_limit(tokens):
+        # on its own line when a trailing -- comment would otherwise swallow it
+        sep = "\n" if "--" in cleaned else " "
+        cleaned = f"{cleaned.rstrip()}{sep}LIMIT {max_rows}"
 
     return cleaned
 
 
 def execute_sql(sql: str, row_limit=1000):
     sql = basic_sanitize_and_enforce(sql)
-    with connection.cursor() as cursor:
+    with connections[QUERY_DB_ALIAS].cursor() as cursor:
         cursor.execute(sql)
         result = cursor.fetchmany(row_limit)
     return result
\ No newline at end of file
@@ -1,15 +1,48 @@
+import csv
+import io
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from django.db import connection
+from django.db import close_old_connections, connections
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from .serializers import Text2SQLRequestSerializer
 from .services.gemini_client import GeminiWrapper
-from .services.sql_sanitizer import basic_sanitize_and_enforce, SQLSanitizerError
+from .services.sql_sanitizer import QUERY_DB_ALIAS, basic_sanitize_and_enforce, SQLSanitizerError
 from .models import QueryLog
-import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# QueryLog rows are audit-only, so they're written off the request path
+_log_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="querylog")
+
+# one Gemini client per process, built on first use (it reads the schema)
+_gemini = None
+_gemini_lock = threading.Lock()
+
+
+def get_gemini():
+    global _gemini
+    if _gemini is None:
+        with _gemini_lock:
+            if _gemini is None:
+                _gemini = GeminiWrapper()
+    return _gemini
+
+
+def _save_log(log):
+    # the worker thread has its own connection; drop it if it's stale or broken
+    close_old_connections()
+    try:
+        log.save()
+    except Exception:
+        logger.exception("Could not save QueryLog for %r", log.nl_query)
+    finally:
+        close_old_connections()
 
 
 class Text2SQLAPIView(APIView):
@@ -30,48 +63,41 @@ class Text2SQLAPIView(APIView):
         out_format = data.get("format", "json")
         max_rows = data.get("max_rows", 1000)
 
-        log = QueryLog.objects.create(nl_query=nl_query, status="running")
+        # filled in as the request goes and written once at the end, in the background
+        log = QueryLog(nl_query=nl_query, status="running")
         start = time.time()
 
         try:
-            gem = GeminiWrapper()
-            raw_sql = gem.nl_to_sql(nl_query=nl_query, schema_hint=schema_hint)
+            raw_sql = get_gemini().nl_to_sql(nl_query=nl_query, schema_hint=schema_hint)
             log.generated_sql = raw_sql
-            log.save()
 
             # sanitize & enforce SELECT-only + LIMIT
             sql = basic_sanitize_and_enforce(raw_sql, max_rows)
-            print(f"Sanitized SQL: {sql}")  # for debugging
-            # Execute with statement_timeout set (milliseconds)
-            with connection.cursor() as cursor:
-                # set local statement_timeout for this transaction (5s = 5000ms)
-                cursor.execute("SET LOCAL statement_timeout = %s", ["5000"])
-                # Execute query
+            logger.debug("Sanitized SQL: %s", sql)
+            # Execute on the text2sql connection; its statement_timeout (5s) is set in settings
+            with connections[QUERY_DB_ALIAS].cursor() as cursor:
                 cursor.execute(sql)
-                columns = [col[0] for col in cursor.description] if cursor.description else []
-                rows = cursor.fetchall()
+                columns = tuple(col[0] for col in cursor.description) if cursor.description else ()
+                rows = cursor.fetchmany(max_rows)
 
             runtime = time.time() - start
             log.status = "success"
-            log.meta = {"runtime_s": runtime, "row_count": len(rows)}
-            log.save()
+            row_count = len(rows)
+            log.meta = {"runtime_s": runtime, "row_count": row_count}
 
             # Format results
-            results = [dict(zip(columns, r)) for r in rows]
-
             if out_format == "dataframe_csv":
-                if pd is None:
-                    return Response(
-                        {"error": "pandas is not installed on server."},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                    )
-                df = pd.DataFrame(results)
-                csv = df.to_csv(index=False)
+                # write the row tuples straight out, no intermediate DataFrame
+                buf = io.StringIO()
+                writer = csv.writer(buf, lineterminator="\n")
+                writer.writerow(columns)
+                writer.writerows(rows)
                 return Response(
-                    {"csv": csv, "rows": len(results)},
+                    {"csv": buf.getvalue(), "rows": row_count},
                     status=status.HTTP_200_OK
                 )
 
+            results = [dict(zip(columns, r)) for r in rows]
             return Response(
                 {"sql": sql, "rows": results, "meta": log.meta},
                 status=status.HTTP_200_OK
@@ -80,15 +106,16 @@ class Text2SQLAPIView(APIView):
         except SQLSanitizerError as e:
             log.status = "rejected"
             log.error = str(e)
-            log.save()
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             # Handle DB timeouts or other runtime errors
             log.status = "error"
             log.error = str(e)
-            log.save()
             return Response(
                 {"error": "Execution failed", "detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+        finally:
+            _log_pool.submit(_save_log, log)
\ No newline at end of file